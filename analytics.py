@@ -4,17 +4,67 @@ Generates visualizations and analytics reports
 """
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 import json
 import os
+import functools
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import traceback
 
+from data_manager import CSV_READ_OPTIONS, HAS_PYARROW, _json_default
+
+# orjson serializes NumPy scalars/arrays natively; fall back to the stdlib otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@functools.cache
+def _go():
+    """Import plotly.graph_objects on first use; it is slow to load"""
+    import plotly.graph_objects
+    return plotly.graph_objects
+
+@functools.cache
+def _qualitative():
+    """Plotly's qualitative colour sequences, imported on first use"""
+    import plotly.colors
+    return plotly.colors.qualitative
+
+def _memoized(table):
+    """Reuse a generator's stats until the backing CSV table changes"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self):
+            # Fingerprint before reading so a concurrent write invalidates the entry
+            fingerprint = self._fingerprint(table)
+            cached = self._cache.get(func.__name__)
+            if (cached is not None and fingerprint is not None and cached[0] == fingerprint
+                    and all(os.path.exists(path) for path in cached[2])):
+                self._log(f"{table}.csv unchanged, reusing cached {func.__name__} results")
+                return cached[1]
+            
+            self._local.viz_paths = []
+            stats = func(self)
+            if fingerprint is not None and 'error' not in stats:
+                # Cached by _flush_writes once the charts are on disk
+                with self._writes_lock:
+                    self._pending_memos.append((func.__name__, (fingerprint, stats, tuple(self._local.viz_paths))))
+            if not self._batch_writes:
+                self._flush_writes()
+            return stats
+        return wrapper
+    return decorator
+
 class HospitalAnalytics:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, static_only=False):
         self.dm = data_manager
         
+        # Render charts as static PNGs (needs kaleido >= 1.0) instead of HTML
+        self.static_only = static_only
+        
         # Method 1: Using data_dir to find project folder
         project_dir = os.path.dirname(self.dm.data_dir)  
         
@@ -26,14 +76,205 @@ class HospitalAnalytics:
         
         # Create visualizations directory
         os.makedirs(self.viz_dir, exist_ok=True)
+        
+        # Memoized generator results: name -> (fingerprint, stats, viz_paths)
+        self._cache = {}
+        
+        # Per-thread list of charts saved by the generator currently running
+        self._local = threading.local()
+        
+        self.dashboard_file = os.path.join(self.dm.data_dir, 'dashboard_data.json')
+        
+        # Data manager version the saved dashboard was generated from, and
+        # the charts that dashboard needs on disk to be reused
+        self._last_version = None
+        self._dashboard_charts = None
+        
+        # Loaded tables: name -> (fingerprint, DataFrame)
+        self._df_cache = {}
+        
+        # Grouped sums shared across reports: (by, column) -> (DataFrame, Series)
+        self._group_cache = {}
+        
+        # Figures queued by _save_figure as (path, fig, signature)
+        self._pending_writes = []
+        # Memo entries waiting on those figures: (name, entry)
+        self._pending_memos = []
+        self._writes_lock = threading.Lock()
+        self._batch_writes = False
         print(f"Analytics initialized. Visualizations will be saved to: {self.viz_dir}")
         print(f"    Visualizations path: {os.path.abspath(self.viz_dir)}")
     
+    def _log(self, message):
+        """Print a line, or hold it for the caller if this thread collects its output"""
+        lines = getattr(self._local, 'log', None)
+        if lines is None:
+            print(message)
+        else:
+            lines.append(message)
+    
+    def _logged(self, func, lines):
+        """Run func with the lines it logs held in lines instead of printed"""
+        self._local.log = lines
+        try:
+            return func()
+        finally:
+            self._local.log = None
+    
+    def _fingerprint(self, table):
+        """Return (mtime, size) of a data table CSV, or None if it is missing"""
+        try:
+            st = os.stat(os.path.join(self.dm.data_dir, f'{table}.csv'))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _df(self, table):
+        """Return a data table, re-reading it only when its CSV has changed"""
+        fingerprint = self._fingerprint(table)
+        cached = self._df_cache.get(table)
+        if cached is not None and fingerprint is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        loaders = {
+            'patients': self.dm.get_all_patients,
+            'appointments': self.dm.get_all_appointments,
+            'billing': self.dm.get_all_bills
+        }
+        df = loaders[table]()
+        if fingerprint is not None:
+            self._df_cache[table] = (fingerprint, df)
+        return df
+    
+    def _grouped_sum(self, df, by, column):
+        """Sum of column per value of by, computed once per loaded table"""
+        cached = self._group_cache.get((by, column))
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        sums = df.groupby(by, observed=True)[column].sum()
+        self._group_cache[(by, column)] = (df, sums)
+        return sums
+    
+    def _counts(self, df, column):
+        """value_counts of a column, or an empty Series if the column is missing"""
+        # Generators call this once per column and share the result between
+        # their charts and stats
+        if column not in df.columns:
+            return pd.Series(dtype=int)
+        return df[column].value_counts()
+    
+    def _pie_figure(self, counts, title, colors):
+        """Pie chart of a Series of counts/amounts indexed by label"""
+        go = _go()
+        fig = go.Figure([go.Pie(
+            values=counts.tolist(),
+            labels=counts.index.tolist(),
+            marker={'colors': colors},
+            textposition='inside',
+            textinfo='percent+label'
+        )])
+        fig.update_layout(title=title)
+        return fig
+    
+    def _bar_figure(self, labels, values, title, label_title, value_title, colorscale, horizontal=False):
+        """Bar chart with bars coloured by value on a continuous scale"""
+        go = _go()
+        x, y = (values, labels) if horizontal else (labels, values)
+        x_title, y_title = (value_title, label_title) if horizontal else (label_title, value_title)
+        fig = go.Figure([go.Bar(
+            x=x,
+            y=y,
+            orientation='h' if horizontal else 'v',
+            marker={'color': values, 'colorscale': colorscale, 'showscale': True}
+        )])
+        fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title)
+        return fig
+    
+    def _signature(self, *parts):
+        """Hash the data a chart is built from (plain lists/dicts, not Series)"""
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    
+    def _save_figure(self, fig, filename, signature=None):
+        """Queue a figure for the visualizations folder unless its data is unchanged"""
+        if self.static_only:
+            filename = os.path.splitext(filename)[0] + '.png'
+        path = os.path.join(self.viz_dir, filename)
+        sig_path = path + '.sig'
+        viz_paths = getattr(self._local, 'viz_paths', None)
+        if viz_paths is not None:
+            viz_paths.append(path)
+        
+        if signature is not None and os.path.exists(path) and os.path.exists(sig_path):
+            with open(sig_path) as f:
+                if f.read() == signature:
+                    self._log(f"Unchanged {path}")
+                    return path
+        
+        with self._writes_lock:
+            self._pending_writes.append((path, fig, signature))
+        return path
+    
+    def _write_signature(self, path, signature):
+        """Record the data signature of a chart that was just written"""
+        if signature is not None:
+            with open(path + '.sig', 'w') as f:
+                f.write(signature)
+    
+    def _write_figure(self, pending):
+        """Write one queued figure as HTML; return the error, or None"""
+        path, fig, signature = pending
+        try:
+            # Load plotly.js from the CDN rather than embedding ~3MB in every file
+            fig.write_html(path, include_plotlyjs='cdn')
+        except OSError as e:
+            return e
+        self._write_signature(path, signature)
+        return None
+    
+    def _flush_writes(self):
+        """Write all queued figures, cache the results they belong to, and return the paths that failed"""
+        with self._writes_lock:
+            pending, self._pending_writes = self._pending_writes, []
+            memos, self._pending_memos = self._pending_memos, []
+        
+        # The folder may have been removed since the last run
+        os.makedirs(self.viz_dir, exist_ok=True)
+        failed = set()
+        if pending and self.static_only:
+            # A single kaleido session renders every queued chart
+            import plotly.io as pio
+            try:
+                pio.write_images([fig for _, fig, _ in pending], [path for path, _, _ in pending])
+            except Exception as e:
+                self._log(f"Error writing static charts: {type(e).__name__}: {str(e).strip()}")
+                failed.update(path for path, _, _ in pending)
+            else:
+                for path, _, signature in pending:
+                    self._write_signature(path, signature)
+                    self._log(f"Generated {path}")
+        elif pending:
+            # Overlap serialization and disk I/O across figures, then report
+            # from this thread in queue order
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                errors = list(executor.map(self._write_figure, pending))
+            for (path, _, _), error in zip(pending, errors):
+                if error is None:
+                    self._log(f"Generated {path}")
+                else:
+                    self._log(f"Error writing {path}: {error}")
+                    failed.add(path)
+        
+        # A cached result is only reused while its charts on disk match it
+        for name, entry in memos:
+            if failed.isdisjoint(entry[2]):
+                self._cache[name] = entry
+        return failed
+    
     def _convert_numpy_types(self, obj):
-        """Convert NumPy types to native Python types for JSON serialization"""
-        if isinstance(obj, (np.integer, np.int64, np.int32)):
+        """Convert NumPy types to native Python types for stdlib JSON serialization"""
+        if isinstance(obj, np.integer):
             return int(obj)
-        elif isinstance(obj, (np.floating, np.float64, np.float32)):
+        elif isinstance(obj, np.floating):
             return float(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
@@ -41,308 +282,318 @@ class HospitalAnalytics:
             return {key: self._convert_numpy_types(value) for key, value in obj.items()}
         elif isinstance(obj, list):
             return [self._convert_numpy_types(item) for item in obj]
-        elif pd.isna(obj):
+        # NaN is the only float not equal to itself; avoids pd.isna dispatch per leaf
+        elif obj is None or obj is pd.NA or (isinstance(obj, float) and obj != obj):
             return None
         else:
             return obj
     
+    @_memoized('patients')
     def generate_patient_statistics(self):
         """Generate patient demographics statistics and charts"""
-        print("Generating patient statistics...")
+        self._log("Generating patient statistics...")
         
-        try:
-            patients_df = self.dm.get_all_patients()
-            
-            if patients_df.empty or len(patients_df) == 0:
-                print("No patient data available")
-                return {"error": "No patient data available", "total_patients": 0}
-            
-            # 1. Gender Distribution Pie Chart
-            gender_counts = patients_df['gender'].value_counts()
-            if len(gender_counts) > 0:
-                fig1 = px.pie(
-                    values=gender_counts.values, 
-                    names=gender_counts.index,
-                    title='Patient Gender Distribution',
-                    color_discrete_sequence=px.colors.qualitative.Set3
-                )
-                fig1.update_traces(textposition='inside', textinfo='percent+label')
-                fig1.write_html(os.path.join(self.viz_dir, 'gender_distribution.html'))
-                print(f"Generated {os.path.join(self.viz_dir, 'gender_distribution.html')}")
-            
-            # 2. Age Distribution Histogram
-            if 'age' in patients_df.columns:
-                fig2 = px.histogram(
-                    patients_df, 
-                    x='age', 
-                    nbins=10,
-                    title='Patient Age Distribution',
-                    labels={'age': 'Age', 'count': 'Number of Patients'},
-                    color_discrete_sequence=['#1f77b4']
-                )
-                fig2.update_layout(bargap=0.1)
-                fig2.write_html(os.path.join(self.viz_dir, 'age_distribution.html'))
-                print(f"Generated {os.path.join(self.viz_dir, 'age_distribution.html')}")
-            
-            # 3. Blood Group Distribution
-            if 'blood_group' in patients_df.columns:
-                blood_group_counts = patients_df['blood_group'].value_counts()
-                if len(blood_group_counts) > 0:
-                    fig3 = px.bar(
-                        x=blood_group_counts.index, 
-                        y=blood_group_counts.values,
-                        title='Blood Group Distribution',
-                        labels={'x': 'Blood Group', 'y': 'Number of Patients'},
-                        color=blood_group_counts.values,
-                        color_continuous_scale='Viridis'
-                    )
-                    fig3.write_html(os.path.join(self.viz_dir, 'blood_group_distribution.html'))
-                    print(f"Generated {os.path.join(self.viz_dir, 'blood_group_distribution.html')}")
-            
-            # Calculate statistics
-            stats = {
-                'total_patients': len(patients_df),
-                'average_age': float(patients_df['age'].mean()) if 'age' in patients_df.columns and not patients_df['age'].isna().all() else 0,
-                'min_age': int(patients_df['age'].min()) if 'age' in patients_df.columns else 0,
-                'max_age': int(patients_df['age'].max()) if 'age' in patients_df.columns else 0,
-                'gender_distribution': gender_counts.to_dict() if len(gender_counts) > 0 else {}
-            }
-            
-            if 'blood_group' in patients_df.columns and not patients_df['blood_group'].mode().empty:
-                stats['most_common_blood_group'] = str(patients_df['blood_group'].mode().iloc[0])
-            else:
-                stats['most_common_blood_group'] = 'N/A'
-            
-            return self._convert_numpy_types(stats)
-            
-        except Exception as e:
-            print(f"Error generating patient statistics: {e}")
-            traceback.print_exc()
-            return {"error": str(e)}
+        patients_df = self._df('patients')
+        
+        if patients_df.empty or len(patients_df) == 0:
+            self._log("No patient data available")
+            return {"error": "No patient data available", "total_patients": 0}
+        
+        gender_counts = self._counts(patients_df, 'gender')
+        blood_group_counts = self._counts(patients_df, 'blood_group')
+        has_age = 'age' in patients_df.columns
+        if has_age:
+            ages = patients_df['age'].tolist()
+            age_summary = patients_df['age'].agg(['mean', 'min', 'max', 'count'])
+        
+        # 1. Gender Distribution Pie Chart
+        if len(gender_counts) > 0:
+            fig1 = self._pie_figure(gender_counts, 'Patient Gender Distribution', _qualitative().Set3)
+            self._save_figure(fig1, 'gender_distribution.html', self._signature(gender_counts.to_dict()))
+        
+        # 2. Age Distribution Histogram
+        if has_age:
+            go = _go()
+            fig2 = go.Figure([go.Histogram(x=ages, nbinsx=10, marker={'color': '#1f77b4'})])
+            fig2.update_layout(
+                title='Patient Age Distribution',
+                xaxis_title='Age',
+                yaxis_title='Number of Patients',
+                bargap=0.1
+            )
+            self._save_figure(fig2, 'age_distribution.html', self._signature(ages))
+        
+        # 3. Blood Group Distribution
+        if len(blood_group_counts) > 0:
+            fig3 = self._bar_figure(
+                blood_group_counts.index.tolist(),
+                blood_group_counts.tolist(),
+                'Blood Group Distribution',
+                'Blood Group', 'Number of Patients', 'Viridis'
+            )
+            self._save_figure(fig3, 'blood_group_distribution.html', self._signature(blood_group_counts.to_dict()))
+        
+        # Calculate statistics
+        stats = {
+            'total_patients': len(patients_df),
+            'average_age': float(age_summary['mean']) if has_age and age_summary['count'] > 0 else 0,
+            'min_age': int(age_summary['min']) if has_age else 0,
+            'max_age': int(age_summary['max']) if has_age else 0,
+            'gender_distribution': gender_counts.to_dict(),
+            # value_counts is sorted descending, so its first label is the mode
+            'most_common_blood_group': str(blood_group_counts.index[0]) if len(blood_group_counts) > 0 else 'N/A'
+        }
+        
+        return stats
     
+    @_memoized('appointments')
     def generate_appointment_analytics(self):
         """Generate appointment statistics and charts"""
-        print("Generating appointment analytics...")
+        self._log("Generating appointment analytics...")
         
-        try:
-            appointments_df = self.dm.get_all_appointments()
-            
-            if appointments_df.empty or len(appointments_df) == 0:
-                print("No appointment data available")
-                return {"error": "No appointment data available", "total_appointments": 0}
-            
-            # 1. Appointment Status Distribution
-            status_counts = appointments_df['status'].value_counts()
-            if len(status_counts) > 0:
-                fig1 = px.pie(
-                    values=status_counts.values, 
-                    names=status_counts.index,
-                    title='Appointment Status Distribution',
-                    color_discrete_sequence=px.colors.qualitative.Pastel
-                )
-                fig1.update_traces(textposition='inside', textinfo='percent+label')
-                fig1.write_html(os.path.join(self.viz_dir, 'appointment_status.html'))
-                print(f"Generated {os.path.join(self.viz_dir, 'appointment_status.html')}")
-            
-            # 2. Department-wise Appointments
-            if 'department' in appointments_df.columns:
-                dept_counts = appointments_df['department'].value_counts()
-                if len(dept_counts) > 0:
-                    fig2 = px.bar(
-                        x=dept_counts.index, 
-                        y=dept_counts.values,
-                        title='Appointments by Department',
-                        labels={'x': 'Department', 'y': 'Number of Appointments'},
-                        color=dept_counts.values,
-                        color_continuous_scale='Blues'
-                    )
-                    fig2.write_html(os.path.join(self.viz_dir, 'department_appointments.html'))
-                    print(f"Generated {os.path.join(self.viz_dir, 'department_appointments.html')}")
-            
-            # Calculate statistics
-            stats = {
-                'total_appointments': len(appointments_df),
-                'scheduled_appointments': len(appointments_df[appointments_df['status'] == 'Scheduled']) if 'status' in appointments_df.columns else 0,
-                'completed_appointments': len(appointments_df[appointments_df['status'] == 'Completed']) if 'status' in appointments_df.columns else 0,
-                'department_distribution': dept_counts.to_dict() if 'department' in appointments_df.columns and len(dept_counts) > 0 else {}
-            }
-            
-            if 'department' in appointments_df.columns and len(dept_counts) > 0:
-                stats['top_department'] = str(dept_counts.index[0])
-            else:
-                stats['top_department'] = 'N/A'
-            
-            return self._convert_numpy_types(stats)
-            
-        except Exception as e:
-            print(f"Error generating appointment analytics: {e}")
-            traceback.print_exc()
-            return {"error": str(e)}
+        appointments_df = self._df('appointments')
+        
+        if appointments_df.empty or len(appointments_df) == 0:
+            self._log("No appointment data available")
+            return {"error": "No appointment data available", "total_appointments": 0}
+        
+        status_counts = self._counts(appointments_df, 'status')
+        dept_counts = self._counts(appointments_df, 'department')
+        
+        # 1. Appointment Status Distribution
+        if len(status_counts) > 0:
+            fig1 = self._pie_figure(status_counts, 'Appointment Status Distribution', _qualitative().Pastel)
+            self._save_figure(fig1, 'appointment_status.html', self._signature(status_counts.to_dict()))
+        
+        # 2. Department-wise Appointments
+        if len(dept_counts) > 0:
+            fig2 = self._bar_figure(
+                dept_counts.index.tolist(),
+                dept_counts.tolist(),
+                'Appointments by Department',
+                'Department', 'Number of Appointments', 'Blues'
+            )
+            self._save_figure(fig2, 'department_appointments.html', self._signature(dept_counts.to_dict()))
+        
+        # Calculate statistics
+        stats = {
+            'total_appointments': len(appointments_df),
+            'scheduled_appointments': int(status_counts.get('Scheduled', 0)),
+            'completed_appointments': int(status_counts.get('Completed', 0)),
+            'department_distribution': dept_counts.to_dict(),
+            'top_department': str(dept_counts.index[0]) if len(dept_counts) > 0 else 'N/A'
+        }
+        
+        return stats
     
+    @_memoized('billing')
     def generate_financial_reports(self):
         """Generate billing and financial reports"""
-        print("Generating financial reports...")
+        self._log("Generating financial reports...")
         
-        try:
-            billing_df = self.dm.get_all_bills()
-            
-            if billing_df.empty or len(billing_df) == 0:
-                print("No billing data available")
-                return {"error": "No billing data available", "total_revenue": 0}
-            
-            # 1. Revenue by Service Type
-            if 'service_type' in billing_df.columns:
-                revenue_by_service = billing_df.groupby('service_type')['amount'].sum()
-                if len(revenue_by_service) > 0:
-                    fig1 = px.pie(
-                        values=revenue_by_service.values, 
-                        names=revenue_by_service.index,
-                        title='Revenue Distribution by Service Type',
-                        color_discrete_sequence=px.colors.qualitative.Set2
-                    )
-                    fig1.update_traces(textposition='inside', textinfo='percent+label')
-                    fig1.write_html(os.path.join(self.viz_dir, 'revenue_by_service.html'))
-                    print(f"Generated {os.path.join(self.viz_dir, 'revenue_by_service.html')}")
-            
-            # 2. Payment Status
-            if 'status' in billing_df.columns:
-                status_counts = billing_df['status'].value_counts()
-                if len(status_counts) > 0:
-                    fig2 = px.bar(
-                        x=status_counts.index, 
-                        y=status_counts.values,
-                        title='Bill Payment Status Distribution',
-                        labels={'x': 'Payment Status', 'y': 'Number of Bills'},
-                        color=status_counts.values,
-                        color_continuous_scale='Reds'
-                    )
-                    fig2.write_html(os.path.join(self.viz_dir, 'payment_status.html'))
-                    print(f"Generated {os.path.join(self.viz_dir, 'payment_status.html')}")
-            
-            # Calculate statistics
-            stats = {
-                'total_revenue': float(billing_df['amount'].sum()) if 'amount' in billing_df.columns else 0,
-                'total_bills': len(billing_df),
-                'pending_amount': float(billing_df[billing_df['status'] == 'Pending']['amount'].sum()) if 'status' in billing_df.columns and 'amount' in billing_df.columns else 0,
-                'paid_amount': float(billing_df[billing_df['status'] == 'Paid']['amount'].sum()) if 'status' in billing_df.columns and 'amount' in billing_df.columns else 0,
-                'average_bill_amount': float(billing_df['amount'].mean()) if 'amount' in billing_df.columns and not billing_df['amount'].isna().all() else 0
-            }
-            
-            if 'service_type' in billing_df.columns and len(revenue_by_service) > 0:
-                stats['most_profitable_service'] = str(revenue_by_service.idxmax())
-            else:
-                stats['most_profitable_service'] = 'N/A'
-            
-            return self._convert_numpy_types(stats)
-            
-        except Exception as e:
-            print(f"Error generating financial reports: {e}")
-            traceback.print_exc()
-            return {"error": str(e)}
+        billing_df = self._df('billing')
+        
+        if billing_df.empty or len(billing_df) == 0:
+            self._log("No billing data available")
+            return {"error": "No billing data available", "total_revenue": 0}
+        
+        has_amount = 'amount' in billing_df.columns
+        status_counts = self._counts(billing_df, 'status')
+        if has_amount and 'service_type' in billing_df.columns:
+            revenue_by_service = self._grouped_sum(billing_df, 'service_type', 'amount')
+        else:
+            revenue_by_service = pd.Series(dtype=float)
+        if has_amount and 'status' in billing_df.columns:
+            amount_by_status = self._grouped_sum(billing_df, 'status', 'amount')
+        else:
+            amount_by_status = pd.Series(dtype=float)
+        if has_amount:
+            amount_summary = billing_df['amount'].agg(['sum', 'mean', 'count'])
+        
+        # 1. Revenue by Service Type
+        if len(revenue_by_service) > 0:
+            fig1 = self._pie_figure(revenue_by_service, 'Revenue Distribution by Service Type', _qualitative().Set2)
+            self._save_figure(fig1, 'revenue_by_service.html', self._signature(revenue_by_service.to_dict()))
+        
+        # 2. Payment Status
+        if len(status_counts) > 0:
+            fig2 = self._bar_figure(
+                status_counts.index.tolist(),
+                status_counts.tolist(),
+                'Bill Payment Status Distribution',
+                'Payment Status', 'Number of Bills', 'Reds'
+            )
+            self._save_figure(fig2, 'payment_status.html', self._signature(status_counts.to_dict()))
+        
+        # Calculate statistics
+        stats = {
+            'total_revenue': float(amount_summary['sum']) if has_amount else 0,
+            'total_bills': len(billing_df),
+            'pending_amount': float(amount_by_status.get('Pending', 0.0)),
+            'paid_amount': float(amount_by_status.get('Paid', 0.0)),
+            'average_bill_amount': float(amount_summary['mean']) if has_amount and amount_summary['count'] > 0 else 0,
+            'most_profitable_service': str(revenue_by_service.idxmax()) if len(revenue_by_service) > 0 else 'N/A'
+        }
+        
+        return stats
     
+    @_memoized('medical_records')
     def generate_medical_analytics(self):
         """Generate medical records analytics"""
-        print("Generating medical analytics...")
+        self._log("Generating medical analytics...")
+        
+        # Read medical records directly from file
+        medical_file = os.path.join(self.dm.data_dir, 'medical_records.csv')
+        if not os.path.exists(medical_file):
+            self._log("No medical records data available")
+            return {"error": "No medical records data available", "total_medical_records": 0}
         
+        # Only the diagnosis column is used, so project it at parse time;
+        # pyarrow's multithreaded reader then skips the other columns
+        read_options = dict(CSV_READ_OPTIONS, engine='pyarrow') if HAS_PYARROW else CSV_READ_OPTIONS
         try:
-            # Read medical records directly from file
-            medical_file = os.path.join(self.dm.data_dir, 'medical_records.csv')
-            if os.path.exists(medical_file):
-                medical_df = pd.read_csv(medical_file)
-            else:
-                print("No medical records data available")
-                return {"error": "No medical records data available", "total_medical_records": 0}
-            
-            if medical_df.empty or len(medical_df) == 0:
-                print("No medical records data available")
-                return {"error": "No medical records data available", "total_medical_records": 0}
-            
-            # 1. Common Diagnoses
-            if 'diagnosis' in medical_df.columns:
-                diagnosis_counts = medical_df['diagnosis'].value_counts().head(10)
-                if len(diagnosis_counts) > 0:
-                    fig1 = px.bar(
-                        x=diagnosis_counts.values, 
-                        y=diagnosis_counts.index,
-                        orientation='h',
-                        title='Top 10 Common Diagnoses',
-                        labels={'x': 'Frequency', 'y': 'Diagnosis'},
-                        color=diagnosis_counts.values,
-                        color_continuous_scale='Oranges'
-                    )
-                    fig1.write_html(os.path.join(self.viz_dir, 'common_diagnoses.html'))
-                    print(f"Generated {os.path.join(self.viz_dir, 'common_diagnoses.html')}")
-            
-            stats = {
-                'total_medical_records': len(medical_df),
-                'diagnosis_distribution': diagnosis_counts.head(5).to_dict() if 'diagnosis' in medical_df.columns and len(diagnosis_counts) > 0 else {}
-            }
-            
-            if 'diagnosis' in medical_df.columns and len(diagnosis_counts) > 0:
-                stats['most_common_diagnosis'] = str(diagnosis_counts.index[0])
-            else:
-                stats['most_common_diagnosis'] = 'N/A'
-            
-            return self._convert_numpy_types(stats)
-            
-        except Exception as e:
-            print(f"Error generating medical analytics: {e}")
-            traceback.print_exc()
-            return {"error": str(e)}
+            medical_df = pd.read_csv(medical_file, usecols=['diagnosis'], **read_options)
+        except (ValueError, KeyError):
+            medical_df = pd.read_csv(medical_file, **CSV_READ_OPTIONS)
+        
+        if medical_df.empty or len(medical_df) == 0:
+            self._log("No medical records data available")
+            return {"error": "No medical records data available", "total_medical_records": 0}
+        
+        # Partial selection of the top 10 instead of sorting every diagnosis
+        if 'diagnosis' in medical_df.columns:
+            diagnosis_counts = medical_df['diagnosis'].value_counts(sort=False).nlargest(10)
+        else:
+            diagnosis_counts = pd.Series(dtype=int)
+        
+        # 1. Common Diagnoses
+        if len(diagnosis_counts) > 0:
+            fig1 = self._bar_figure(
+                diagnosis_counts.index.tolist(),
+                diagnosis_counts.tolist(),
+                'Top 10 Common Diagnoses',
+                'Diagnosis', 'Frequency', 'Oranges',
+                horizontal=True
+            )
+            self._save_figure(fig1, 'common_diagnoses.html', self._signature(diagnosis_counts.to_dict()))
+        
+        stats = {
+            'total_medical_records': len(medical_df),
+            'diagnosis_distribution': diagnosis_counts.head(5).to_dict(),
+            'most_common_diagnosis': str(diagnosis_counts.index[0]) if len(diagnosis_counts) > 0 else 'N/A'
+        }
+        
+        return stats
+    
+    def _quick_counts(self):
+        """Headline figures for the overview chart, without running the generators"""
+        patients_df = self._df('patients')
+        appointments_df = self._df('appointments')
+        billing_df = self._df('billing')
+        
+        total_revenue = pending_amount = 0
+        if not billing_df.empty and 'amount' in billing_df.columns:
+            # The data manager keeps a running total, so the column isn't summed again
+            total_revenue = float(self.dm.get_total_revenue())
+            if 'status' in billing_df.columns:
+                pending_amount = float(self._grouped_sum(billing_df, 'status', 'amount').get('Pending', 0.0))
+        
+        return {
+            'Total Patients': len(patients_df),
+            'Total Appointments': len(appointments_df),
+            'Total Revenue': total_revenue,
+            'Pending Bills': pending_amount
+        }
     
     def generate_dashboard_summary(self):
         """Generate comprehensive dashboard with all metrics"""
         print("Generating comprehensive dashboard...")
+        self._dashboard_charts = None
         
         try:
-            # Get all stats
-            patient_stats = self.generate_patient_statistics()
-            appointment_stats = self.generate_appointment_analytics()
-            financial_stats = self.generate_financial_reports()
-            medical_stats = self.generate_medical_analytics()
+            # Queue every chart and write them together once all are built
+            self._batch_writes = True
             
-            dashboard_data = {
-                'patient_stats': patient_stats,
-                'appointment_stats': appointment_stats,
-                'financial_stats': financial_stats,
-                'medical_stats': medical_stats,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            # Create summary visualization
-            summary_stats = {
-                'Total Patients': dashboard_data['patient_stats'].get('total_patients', 0),
-                'Total Appointments': dashboard_data['appointment_stats'].get('total_appointments', 0),
-                'Total Revenue': dashboard_data['financial_stats'].get('total_revenue', 0),
-                'Pending Bills': dashboard_data['financial_stats'].get('pending_amount', 0)
-            }
+            # Create summary visualization from the headline counts alone
+            summary_stats = self._quick_counts()
             
             # Summary bar chart
+            charts = []
             if any(v > 0 for v in summary_stats.values()):
-                fig = px.bar(
-                    x=list(summary_stats.keys()),
-                    y=list(summary_stats.values()),
-                    title='Hospital System Overview',
-                    labels={'x': 'Metrics', 'y': 'Count/Amount'},
-                    color=list(summary_stats.values()),
-                    color_continuous_scale='Viridis'
+                fig = self._bar_figure(
+                    list(summary_stats.keys()),
+                    list(summary_stats.values()),
+                    'Hospital System Overview',
+                    'Metrics', 'Count/Amount', 'Viridis'
                 )
-                fig.write_html(os.path.join(self.viz_dir, 'system_overview.html'))
-                print(f"Generated {os.path.join(self.viz_dir, 'system_overview.html')}")
+                charts.append(self._save_figure(fig, 'system_overview.html', self._signature(summary_stats)))
+            
+            # Detailed stats and charts; each generator reads its own table,
+            # and pandas releases the GIL while parsing and aggregating
+            generators = {
+                'patient_stats': self.generate_patient_statistics,
+                'appointment_stats': self.generate_appointment_analytics,
+                'financial_stats': self.generate_financial_reports,
+                'medical_stats': self.generate_medical_analytics
+            }
+            # Their output is held back and printed here, one generator at a time
+            logs = {key: [] for key in generators}
+            with ThreadPoolExecutor(max_workers=len(generators)) as executor:
+                futures = {key: executor.submit(self._logged, generator, logs[key])
+                           for key, generator in generators.items()}
+                dashboard_data = {}
+                for key, future in futures.items():
+                    error = future.exception()
+                    for line in logs[key]:
+                        print(line)
+                    if error is None:
+                        dashboard_data[key] = future.result()
+                    else:
+                        # A table that fails to aggregate only loses its own section
+                        print(f"Error generating {key}: {error}")
+                        traceback.print_exception(type(error), error, error.__traceback__)
+                        dashboard_data[key] = {"error": str(error)}
+            dashboard_data['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            failed = self._flush_writes()
+            
+            # Only a run where every section and chart came out may be reused
+            # while the data is unchanged; see generate_all_reports
+            entries = [self._cache.get(generator.__name__) for generator in generators.values()]
+            complete = (not failed and all(entry is not None for entry in entries)
+                        and not any('error' in dashboard_data[key] for key in generators))
             
             # Save dashboard data as JSON
-            json_path = os.path.join(self.dm.data_dir, 'dashboard_data.json')
-            with open(json_path, 'w') as f:
-                json.dump(dashboard_data, f, indent=2, default=str)
+            json_path = self.dashboard_file
+            if orjson is not None:
+                # Serialize once to bytes and write them in a single call
+                payload = orjson.dumps(
+                    dashboard_data,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2,
+                    default=_json_default
+                )
+                with open(json_path, 'wb') as f:
+                    f.write(payload)
+            else:
+                with open(json_path, 'w') as f:
+                    json.dump(self._convert_numpy_types(dashboard_data), f, indent=2, default=str)
             
             print(f"Dashboard data saved to {json_path}")
             
+            if complete:
+                self._dashboard_charts = tuple(charts) + tuple(path for entry in entries for path in entry[2])
             return dashboard_data
             
         except Exception as e:
             print(f"Error generating dashboard: {e}")
             traceback.print_exc()
             return {"error": str(e)}
+        
+        finally:
+            self._batch_writes = False
+            with self._writes_lock:
+                self._pending_writes = []
+                self._pending_memos = []
     
     def generate_all_reports(self):
         """Generate all analytics and reports"""
@@ -352,16 +603,28 @@ class HospitalAnalytics:
         
         print(f"Visualizations folder: {os.path.abspath(self.viz_dir)}")
         
+        # Nothing written since the last run: the saved dashboard is still current
+        version = self.dm.version()
+        if (version is not None and version == self._last_version and self._dashboard_charts is not None
+                and os.path.exists(self.dashboard_file)
+                and all(os.path.exists(path) for path in self._dashboard_charts)):
+            print("No data changes since last run, reusing saved dashboard data")
+            with open(self.dashboard_file) as f:
+                return json.load(f)
+        
         dashboard_data = self.generate_dashboard_summary()
+        # Set only when every section and chart was written
+        self._last_version = version if self._dashboard_charts is not None else None
         
         print("\n" + "=" * 50)
         print("ALL REPORTS GENERATED SUCCESSFULLY!")
         print("=" * 50)
-        print(f"Check the '{self.viz_dir}' folder for HTML charts")
+        print(f"Check the '{self.viz_dir}' folder for {'PNG' if self.static_only else 'HTML'} charts")
         print(f"Check '{self.dm.data_dir}/dashboard_data.json' for analytics data")
         
-        # Count generated files
-        viz_files = [f for f in os.listdir(self.viz_dir) if f.endswith('.html')]
+        # Count generated files; charts left over from the other mode don't count
+        extension = '.png' if self.static_only else '.html'
+        viz_files = [f for f in os.listdir(self.viz_dir) if f.endswith(extension)]
         print(f"Generated {len(viz_files)} visualization files")
         
         # Show full paths
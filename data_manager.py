@@ -4,11 +4,93 @@ Handles patient records, appointments, medical records, and billing
 """
 import pandas as pd
 import numpy as np
+import csv
 import json
 import os
+import time
 from datetime import datetime, timedelta
 import traceback
 
+# Parse CSVs into Arrow-backed columns when pyarrow is installed so string
+# columns hash and aggregate in Arrow kernels instead of Python objects
+try:
+    import pyarrow
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CSV_READ_OPTIONS = {'dtype_backend': 'pyarrow'} if HAS_PYARROW else {}
+
+# orjson encodes straight to bytes and is much faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Column order of each CSV file
+PATIENT_COLS = (
+    'patient_id', 'name', 'age', 'gender', 'contact',
+    'address', 'email', 'registration_date', 'blood_group'
+)
+APPOINTMENT_COLS = (
+    'appointment_id', 'patient_id', 'patient_name', 'doctor_name',
+    'department', 'appointment_date', 'appointment_time', 'status', 'notes'
+)
+MEDICAL_COLS = (
+    'record_id', 'patient_id', 'visit_date', 'symptoms',
+    'diagnosis', 'treatment', 'medication', 'tests', 'notes'
+)
+BILLING_COLS = (
+    'bill_id', 'patient_id', 'patient_name', 'bill_date',
+    'service_type', 'description', 'amount', 'status', 'due_date'
+)
+
+# Every column except IDs, age and amount is free text. Declaring those up
+# front lets the parser skip type inference on them
+NUMERIC_COLUMNS = {
+    'patient_id', 'appointment_id', 'record_id', 'bill_id', 'age', 'amount'
+}
+TEXT_DTYPE = pd.ArrowDtype(pyarrow.string()) if HAS_PYARROW else str
+CSV_DTYPES = {
+    col: TEXT_DTYPE
+    for cols in (PATIENT_COLS, APPOINTMENT_COLS, MEDICAL_COLS, BILLING_COLS)
+    for col in cols
+    if col not in NUMERIC_COLUMNS
+}
+
+# pyarrow's multithreaded CSV reader, given the same text columns. Quoted
+# values may span lines since addresses and notes are free text
+if HAS_PYARROW:
+    ARROW_PARSE_OPTIONS = pacsv.ParseOptions(newlines_in_values=True)
+    ARROW_CONVERT_OPTIONS = pacsv.ConvertOptions(
+        column_types={col: pyarrow.string() for col in CSV_DTYPES}
+    )
+
+# Low-cardinality text columns held as categoricals so value_counts and
+# groupby work on integer codes rather than hashing every string
+CATEGORICAL_COLUMNS = {
+    'patients': ('gender', 'blood_group'),
+    'appointments': ('department', 'status'),
+    'billing': ('service_type', 'status')
+}
+
+def _json_default(obj):
+    """Serialize values orjson has no native encoding for"""
+    try:
+        if pd.isna(obj):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(obj)
+
+def _dump_record(record):
+    """Serialize one exported row to JSON bytes"""
+    # Blank numeric cells read by pyarrow are pd.NA; export them as null
+    if orjson is not None:
+        return orjson.dumps(record, default=_json_default)
+    return json.dumps(record, default=_json_default).encode()
+
 class HospitalDataManager:
     def __init__(self):
         # Get the current directory
@@ -23,6 +105,24 @@ class HospitalDataManager:
         self.appointments_file = os.path.join(self.data_dir, 'appointments.csv')
         self.medical_file = os.path.join(self.data_dir, 'medical_records.csv')
         self.billing_file = os.path.join(self.data_dir, 'billing.csv')
+        self._meta_path = os.path.join(self.data_dir, '_meta.json')
+        
+        # File holding each ID column
+        self._id_files = {
+            'patient_id': self.patients_file,
+            'appointment_id': self.appointments_file,
+            'record_id': self.medical_file,
+            'bill_id': self.billing_file
+        }
+        
+        # Parsed CSVs keyed by path, each stored with the stat it was read at
+        self._cache = {}
+        
+        # Categorical copies of the cached frames: table -> (raw frame, converted frame)
+        self._categorical = {}
+        
+        # Minute the cached date strings were formatted in
+        self._date_minute = None
         
         # Initialize data files
         self._init_data_files()
@@ -31,41 +131,19 @@ class HospitalDataManager:
     def _init_data_files(self):
         """Initialize CSV files with headers if they don't exist"""
         try:
-            # Patients CSV
-            if not os.path.exists(self.patients_file):
-                patients_df = pd.DataFrame(columns=[
-                    'patient_id', 'name', 'age', 'gender', 'contact', 
-                    'address', 'email', 'registration_date', 'blood_group'
-                ])
-                patients_df.to_csv(self.patients_file, index=False)
-                print("Created patients.csv")
-            
-            # Appointments CSV
-            if not os.path.exists(self.appointments_file):
-                appointments_df = pd.DataFrame(columns=[
-                    'appointment_id', 'patient_id', 'patient_name', 'doctor_name',
-                    'department', 'appointment_date', 'appointment_time', 'status', 'notes'
-                ])
-                appointments_df.to_csv(self.appointments_file, index=False)
-                print("Created appointments.csv")
+            for path, columns in (
+                (self.patients_file, PATIENT_COLS),
+                (self.appointments_file, APPOINTMENT_COLS),
+                (self.medical_file, MEDICAL_COLS),
+                (self.billing_file, BILLING_COLS)
+            ):
+                if not os.path.exists(path):
+                    with open(path, 'w', newline='', encoding='utf-8') as f:
+                        csv.writer(f, lineterminator=os.linesep).writerow(columns)
+                    print(f"Created {os.path.basename(path)}")
             
-            # Medical Records CSV
-            if not os.path.exists(self.medical_file):
-                medical_df = pd.DataFrame(columns=[
-                    'record_id', 'patient_id', 'visit_date', 'symptoms', 
-                    'diagnosis', 'treatment', 'medication', 'tests', 'notes'
-                ])
-                medical_df.to_csv(self.medical_file, index=False)
-                print("Created medical_records.csv")
-            
-            # Billing CSV
-            if not os.path.exists(self.billing_file):
-                billing_df = pd.DataFrame(columns=[
-                    'bill_id', 'patient_id', 'patient_name', 'bill_date',
-                    'service_type', 'description', 'amount', 'status', 'due_date'
-                ])
-                billing_df.to_csv(self.billing_file, index=False)
-                print("Created billing.csv")
+            # Highest ID, row count and revenue per file, then tracked in memory
+            self._load_meta()
                 
         except Exception as e:
             print(f"Error initializing data files: {e}")
@@ -76,22 +154,10 @@ class HospitalDataManager:
     def add_patient(self, name, age, gender, contact, address, email="", blood_group=""):
         """Add new patient to CSV"""
         try:
-            patients_df = pd.read_csv(self.patients_file)
-            
-            new_patient = {
-                'patient_id': self._generate_id(patients_df, 'patient_id'),
-                'name': name,
-                'age': int(age),
-                'gender': gender,
-                'contact': str(contact),
-                'address': address,
-                'email': email,
-                'registration_date': datetime.now().strftime('%Y-%m-%d'),
-                'blood_group': blood_group
-            }
+            new_patient = self._patient_row(name, age, gender, contact, address, email, blood_group)
+            new_patient['patient_id'] = self._generate_id('patient_id')
             
-            patients_df = pd.concat([patients_df, pd.DataFrame([new_patient])], ignore_index=True)
-            patients_df.to_csv(self.patients_file, index=False)
+            self._append_rows(self.patients_file, PATIENT_COLS, [new_patient])
             print(f"Patient '{name}' registered successfully with ID: {new_patient['patient_id']}")
             return new_patient['patient_id']
         
@@ -100,11 +166,45 @@ class HospitalDataManager:
             traceback.print_exc()
             return None
     
+    def add_patients(self, patients):
+        """Add many patients (dicts of add_patient arguments) in one write"""
+        try:
+            new_patients = [self._patient_row(**patient) for patient in patients]
+            for new_patient, patient_id in zip(new_patients, self._generate_ids('patient_id', len(new_patients))):
+                new_patient['patient_id'] = patient_id
+            
+            self._append_rows(self.patients_file, PATIENT_COLS, new_patients)
+            print(f"{len(new_patients)} patients registered successfully")
+            return [new_patient['patient_id'] for new_patient in new_patients]
+        
+        except Exception as e:
+            print(f"Error adding patients: {e}")
+            traceback.print_exc()
+            return None
+    
+    def _patient_row(self, name, age, gender, contact, address, email="", blood_group=""):
+        """Build a patient record, without its ID"""
+        return {
+            'name': name,
+            'age': int(age),
+            'gender': gender,
+            'contact': str(contact),
+            'address': address,
+            'email': email,
+            'registration_date': self._today(),
+            'blood_group': blood_group
+        }
+    
+    @property
+    def patient_count(self):
+        """Number of registered patients, from the tracked row count"""
+        return self._table_meta('patient_id')['rows']
+    
     def get_all_patients(self):
         """Get all patients from CSV"""
         try:
-            df = pd.read_csv(self.patients_file)
-            return df.fillna('')
+            df = self._load(self.patients_file)
+            return self._as_categories(df, 'patients')
         except Exception as e:
             print(f"Error reading patients: {e}")
             return pd.DataFrame()
@@ -112,13 +212,15 @@ class HospitalDataManager:
     def search_patients(self, search_term):
         """Search patients by name or ID"""
         try:
-            patients_df = pd.read_csv(self.patients_file)
+            patients_df = self._load(self.patients_file)
             if patients_df.empty:
                 return patients_df
             
-            mask = (patients_df['name'].astype(str).str.contains(str(search_term), case=False, na=False) | 
-                    patients_df['patient_id'].astype(str).str.contains(str(search_term), na=False))
-            return patients_df[mask].fillna('')
+            # Literal matches on the text-typed columns stay in the string kernels
+            term = str(search_term)
+            mask = (patients_df['name'].str.contains(term, case=False, regex=False, na=False) | 
+                    patients_df['patient_id'].astype(TEXT_DTYPE).str.contains(term, regex=False, na=False))
+            return patients_df[mask]
         except Exception as e:
             print(f"Error searching patients: {e}")
             return pd.DataFrame()
@@ -126,8 +228,7 @@ class HospitalDataManager:
     def get_patient_by_id(self, patient_id):
         """Get specific patient by ID"""
         try:
-            patients_df = pd.read_csv(self.patients_file)
-            result = patients_df[patients_df['patient_id'] == patient_id].fillna('')
+            result = self._lookup(self.patients_file, 'patient_id', patient_id)
             if len(result) == 0:
                 print(f"Patient ID {patient_id} not found")
             return result
@@ -140,30 +241,14 @@ class HospitalDataManager:
     def schedule_appointment(self, patient_id, doctor_name, department, appointment_date, appointment_time, notes=""):
         """Schedule new appointment"""
         try:
-            appointments_df = pd.read_csv(self.appointments_file)
-            patients_df = pd.read_csv(self.patients_file)
-            
-            patient_data = patients_df[patients_df['patient_id'] == patient_id]
-            if patient_data.empty:
-                print(f"Patient ID {patient_id} not found")
+            new_appointment = self._appointment_row(
+                patient_id, doctor_name, department, appointment_date, appointment_time, notes
+            )
+            if new_appointment is None:
                 return None
+            new_appointment['appointment_id'] = self._generate_id('appointment_id')
             
-            patient_name = patient_data['name'].iloc[0]
-            
-            new_appointment = {
-                'appointment_id': self._generate_id(appointments_df, 'appointment_id'),
-                'patient_id': patient_id,
-                'patient_name': patient_name,
-                'doctor_name': doctor_name,
-                'department': department,
-                'appointment_date': appointment_date,
-                'appointment_time': appointment_time,
-                'status': 'Scheduled',
-                'notes': str(notes)  # Ensure notes is string
-            }
-            
-            appointments_df = pd.concat([appointments_df, pd.DataFrame([new_appointment])], ignore_index=True)
-            appointments_df.to_csv(self.appointments_file, index=False)
+            self._append_rows(self.appointments_file, APPOINTMENT_COLS, [new_appointment])
             print(f"Appointment scheduled with Dr. {doctor_name} for {appointment_date} at {appointment_time}")
             return new_appointment['appointment_id']
         
@@ -172,11 +257,47 @@ class HospitalDataManager:
             traceback.print_exc()
             return None
     
+    def schedule_appointments(self, appointments):
+        """Schedule many appointments (dicts of schedule_appointment arguments) in one write"""
+        try:
+            new_appointments = [self._appointment_row(**appointment) for appointment in appointments]
+            scheduled = [row for row in new_appointments if row is not None]
+            for new_appointment, appointment_id in zip(scheduled, self._generate_ids('appointment_id', len(scheduled))):
+                new_appointment['appointment_id'] = appointment_id
+            
+            self._append_rows(self.appointments_file, APPOINTMENT_COLS, scheduled)
+            print(f"{len(scheduled)} appointments scheduled")
+            # None marks appointments whose patient was not found
+            return [row and row['appointment_id'] for row in new_appointments]
+        
+        except Exception as e:
+            print(f"Error scheduling appointments: {e}")
+            traceback.print_exc()
+            return None
+    
+    def _appointment_row(self, patient_id, doctor_name, department, appointment_date, appointment_time, notes=""):
+        """Build an appointment record without its ID, or None if the patient is unknown"""
+        patient_data = self._lookup(self.patients_file, 'patient_id', patient_id)
+        if patient_data.empty:
+            print(f"Patient ID {patient_id} not found")
+            return None
+        
+        return {
+            'patient_id': patient_id,
+            'patient_name': patient_data['name'].iloc[0],
+            'doctor_name': doctor_name,
+            'department': department,
+            'appointment_date': appointment_date,
+            'appointment_time': appointment_time,
+            'status': 'Scheduled',
+            'notes': str(notes)  # Ensure notes is string
+        }
+    
     def get_all_appointments(self):
         """Get all appointments"""
         try:
-            df = pd.read_csv(self.appointments_file)
-            return df.fillna('')
+            df = self._load(self.appointments_file)
+            return self._as_categories(df, 'appointments')
         except Exception as e:
             print(f"Error reading appointments: {e}")
             return pd.DataFrame()
@@ -184,10 +305,10 @@ class HospitalDataManager:
     def get_appointments_by_date(self, date):
         """Get appointments for specific date"""
         try:
-            appointments_df = pd.read_csv(self.appointments_file)
+            appointments_df = self._load(self.appointments_file)
             if appointments_df.empty:
                 return appointments_df
-            return appointments_df[appointments_df['appointment_date'] == date].fillna('')
+            return self._lookup(self.appointments_file, 'appointment_date', date)
         except Exception as e:
             print(f"Error getting appointments by date: {e}")
             return pd.DataFrame()
@@ -197,22 +318,10 @@ class HospitalDataManager:
     def add_medical_record(self, patient_id, symptoms, diagnosis, treatment, medication, tests, notes):
         """Add medical record"""
         try:
-            medical_df = pd.read_csv(self.medical_file)
+            new_record = self._medical_row(patient_id, symptoms, diagnosis, treatment, medication, tests, notes)
+            new_record['record_id'] = self._generate_id('record_id')
             
-            new_record = {
-                'record_id': self._generate_id(medical_df, 'record_id'),
-                'patient_id': patient_id,
-                'visit_date': datetime.now().strftime('%Y-%m-%d'),
-                'symptoms': str(symptoms),
-                'diagnosis': str(diagnosis),
-                'treatment': str(treatment),
-                'medication': str(medication),
-                'tests': str(tests),
-                'notes': str(notes)
-            }
-            
-            medical_df = pd.concat([medical_df, pd.DataFrame([new_record])], ignore_index=True)
-            medical_df.to_csv(self.medical_file, index=False)
+            self._append_rows(self.medical_file, MEDICAL_COLS, [new_record])
             print(f"Medical record added for patient ID: {patient_id}")
             return new_record['record_id']
         
@@ -221,13 +330,42 @@ class HospitalDataManager:
             traceback.print_exc()
             return None
     
+    def add_medical_records(self, records):
+        """Add many medical records (dicts of add_medical_record arguments) in one write"""
+        try:
+            new_records = [self._medical_row(**record) for record in records]
+            for new_record, record_id in zip(new_records, self._generate_ids('record_id', len(new_records))):
+                new_record['record_id'] = record_id
+            
+            self._append_rows(self.medical_file, MEDICAL_COLS, new_records)
+            print(f"{len(new_records)} medical records added")
+            return [new_record['record_id'] for new_record in new_records]
+        
+        except Exception as e:
+            print(f"Error adding medical records: {e}")
+            traceback.print_exc()
+            return None
+    
+    def _medical_row(self, patient_id, symptoms, diagnosis, treatment, medication, tests, notes):
+        """Build a medical record, without its ID"""
+        return {
+            'patient_id': patient_id,
+            'visit_date': self._today(),
+            'symptoms': str(symptoms),
+            'diagnosis': str(diagnosis),
+            'treatment': str(treatment),
+            'medication': str(medication),
+            'tests': str(tests),
+            'notes': str(notes)
+        }
+    
     def get_patient_medical_history(self, patient_id):
         """Get medical history for a patient"""
         try:
-            medical_df = pd.read_csv(self.medical_file)
+            medical_df = self._load(self.medical_file)
             if medical_df.empty:
                 return medical_df
-            return medical_df[medical_df['patient_id'] == patient_id].fillna('')
+            return self._lookup(self.medical_file, 'patient_id', patient_id)
         except Exception as e:
             print(f"Error getting medical history: {e}")
             return pd.DataFrame()
@@ -237,31 +375,13 @@ class HospitalDataManager:
     def generate_bill(self, patient_id, service_type, description, amount):
         """Generate new bill"""
         try:
-            billing_df = pd.read_csv(self.billing_file)
-            patients_df = pd.read_csv(self.patients_file)
-            
-            patient_data = patients_df[patients_df['patient_id'] == patient_id]
-            if patient_data.empty:
-                print(f"Patient ID {patient_id} not found")
+            new_bill = self._bill_row(patient_id, service_type, description, amount)
+            if new_bill is None:
                 return None
+            new_bill['bill_id'] = self._generate_id('bill_id')
             
-            patient_name = patient_data['name'].iloc[0]
-            
-            new_bill = {
-                'bill_id': self._generate_id(billing_df, 'bill_id'),
-                'patient_id': patient_id,
-                'patient_name': patient_name,
-                'bill_date': datetime.now().strftime('%Y-%m-%d'),
-                'service_type': service_type,
-                'description': description,
-                'amount': float(amount),
-                'status': 'Pending',
-                'due_date': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-            }
-            
-            billing_df = pd.concat([billing_df, pd.DataFrame([new_bill])], ignore_index=True)
-            billing_df.to_csv(self.billing_file, index=False)
-            print(f"Bill generated for {patient_name}: ${amount} for {service_type}")
+            self._append_rows(self.billing_file, BILLING_COLS, [new_bill])
+            print(f"Bill generated for {new_bill['patient_name']}: ${amount} for {service_type}")
             return new_bill['bill_id']
         
         except Exception as e:
@@ -269,13 +389,49 @@ class HospitalDataManager:
             traceback.print_exc()
             return None
     
+    def generate_bills(self, bills):
+        """Generate many bills (dicts of generate_bill arguments) in one write"""
+        try:
+            new_bills = [self._bill_row(**bill) for bill in bills]
+            generated = [row for row in new_bills if row is not None]
+            for new_bill, bill_id in zip(generated, self._generate_ids('bill_id', len(generated))):
+                new_bill['bill_id'] = bill_id
+            
+            self._append_rows(self.billing_file, BILLING_COLS, generated)
+            print(f"{len(generated)} bills generated")
+            # None marks bills whose patient was not found
+            return [row and row['bill_id'] for row in new_bills]
+        
+        except Exception as e:
+            print(f"Error generating bills: {e}")
+            traceback.print_exc()
+            return None
+    
+    def _bill_row(self, patient_id, service_type, description, amount):
+        """Build a bill without its ID, or None if the patient is unknown"""
+        patient_data = self._lookup(self.patients_file, 'patient_id', patient_id)
+        if patient_data.empty:
+            print(f"Patient ID {patient_id} not found")
+            return None
+        
+        return {
+            'patient_id': patient_id,
+            'patient_name': patient_data['name'].iloc[0],
+            'bill_date': self._today(),
+            'service_type': service_type,
+            'description': description,
+            'amount': float(amount),
+            'status': 'Pending',
+            'due_date': self._due_date()
+        }
+    
     def get_patient_bills(self, patient_id):
         """Get all bills for a patient"""
         try:
-            billing_df = pd.read_csv(self.billing_file)
+            billing_df = self._load(self.billing_file)
             if billing_df.empty:
                 return billing_df
-            return billing_df[billing_df['patient_id'] == patient_id].fillna('')
+            return self._lookup(self.billing_file, 'patient_id', patient_id)
         except Exception as e:
             print(f"Error getting patient bills: {e}")
             return pd.DataFrame()
@@ -283,56 +439,199 @@ class HospitalDataManager:
     def get_all_bills(self):
         """Get all bills"""
         try:
-            df = pd.read_csv(self.billing_file)
-            return df.fillna('')
+            df = self._load(self.billing_file)
+            return self._as_categories(df, 'billing')
         except Exception as e:
             print(f"Error reading bills: {e}")
             return pd.DataFrame()
     
+    def get_total_revenue(self):
+        """Get the total billed amount from the running total"""
+        try:
+            return self._table_meta('bill_id')['total_revenue']
+        except Exception as e:
+            print(f"Error getting total revenue: {e}")
+            return 0
+    
     # ==================== UTILITY METHODS ====================
     
-    def _generate_id(self, df, id_column):
-        """Generate unique ID"""
-        if len(df) == 0:
-            return 1001
+    def version(self):
+        """Return a token that changes whenever any data file is written"""
+        try:
+            return max(os.stat(path).st_mtime_ns for path in (
+                self.patients_file, self.appointments_file, self.medical_file, self.billing_file
+            ))
+        except OSError:
+            return None
+    
+    def _load(self, path):
+        """Read a CSV, reusing the parsed frame while the file is unchanged"""
+        key = self._stat_key(path)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        # Blank cells stay as '' instead of becoming NaN that every reader
+        # would otherwise have to fill back in
+        if HAS_PYARROW:
+            table = pacsv.read_csv(
+                path, parse_options=ARROW_PARSE_OPTIONS, convert_options=ARROW_CONVERT_OPTIONS
+            )
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            df = pd.read_csv(path, dtype=CSV_DTYPES, na_filter=False)
+        self._cache[path] = (key, df, {})
+        return df
+    
+    def _lookup(self, path, column, value):
+        """Rows of a CSV whose column equals value, found via a hash index"""
+        df = self._load(path)
+        indexes = self._cache[path][2]
+        index = indexes.get(column)
+        if index is None:
+            # Built on first use and dropped together with the cached frame
+            index = {}
+            for row, key in enumerate(df[column].tolist()):
+                index.setdefault(key, []).append(row)
+            indexes[column] = index
+        return df.iloc[index.get(value, [])]
+    
+    def _append_rows(self, path, columns, rows):
+        """Append records to the end of a CSV instead of rewriting the file"""
+        if not rows:
+            return
+        with open(path, 'a', newline='', encoding='utf-8', buffering=1 << 16) as f:
+            csv.DictWriter(f, fieldnames=columns, lineterminator=os.linesep).writerows(rows)
+        self._cache.pop(path, None)
+        self._record_rows(columns[0], rows)
+    
+    def _stat_key(self, path):
+        """Modification time and size, which change whenever a file is written"""
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    def _load_meta(self):
+        """Restore per-table totals from _meta.json, rescanning files changed since"""
+        try:
+            with open(self._meta_path) as f:
+                self._meta = json.load(f)
+        except (OSError, ValueError):
+            self._meta = {}
+        
+        for id_column in self._id_files:
+            self._table_meta(id_column)
+        self._save_meta()
+    
+    def _save_meta(self):
+        """Write per-table totals with the file state they are valid for"""
+        try:
+            with open(self._meta_path, 'w') as f:
+                json.dump(self._meta, f)
+        except OSError as e:
+            print(f"Error saving metadata: {e}")
+    
+    def _table_meta(self, id_column):
+        """Highest ID, row count and revenue of a table, rescanned if its file changed"""
+        path = self._id_files[id_column]
+        stat = self._stat_key(path)
+        entry = self._meta.get(id_column)
+        if not entry or entry.get('stat') != stat or 'rows' not in entry:
+            entry = self._scan(path, id_column)
+            entry['stat'] = stat
+            self._meta[id_column] = entry
+        return entry
+    
+    def _record_rows(self, id_column, rows):
+        """Fold rows just appended to a table into its totals"""
+        entry = self._meta[id_column]
+        entry['rows'] += len(rows)
+        if 'total_revenue' in entry:
+            entry['total_revenue'] += sum(row['amount'] for row in rows)
+        entry['stat'] = self._stat_key(self._id_files[id_column])
+        self._save_meta()
+    
+    def _as_categories(self, df, table):
+        """Convert a table's known low-cardinality columns to category dtype, once per parse"""
+        cached = self._categorical.get(table)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        # astype returns a new frame, leaving the cached one untouched
+        converted = df.astype({col: 'category' for col in CATEGORICAL_COLUMNS[table] if col in df.columns})
+        self._categorical[table] = (df, converted)
+        return converted
+    
+    def _scan(self, path, id_column):
+        """Read a table's highest ID (1000 when empty), row count and revenue"""
+        entry = {'max_id': 1000, 'rows': 0}
+        usecols = [id_column]
+        if id_column == 'bill_id':
+            entry['total_revenue'] = 0.0
+            usecols.append('amount')
         try:
-            max_id = df[id_column].max()
-            if pd.isna(max_id):
-                return 1001
-            return int(max_id) + 1
-        except:
-            return 1001
+            df = pd.read_csv(path, usecols=usecols)
+        except Exception:
+            return entry
+        
+        entry['rows'] = len(df)
+        max_id = df[id_column].max()
+        if not pd.isna(max_id):
+            entry['max_id'] = int(max_id)
+        if 'total_revenue' in entry:
+            # Unparseable amounts count as 0 rather than blocking ID allocation
+            entry['total_revenue'] = float(pd.to_numeric(df['amount'], errors='coerce').sum())
+        return entry
+    
+    def _today(self):
+        """Today's date string, reformatted at most once a minute"""
+        minute = time.time() // 60
+        if minute != self._date_minute:
+            now = datetime.now()
+            self._today_str = now.strftime('%Y-%m-%d')
+            self._due_date_str = (now + timedelta(days=30)).strftime('%Y-%m-%d')
+            self._date_minute = minute
+        return self._today_str
+    
+    def _due_date(self):
+        """Due date of a bill raised today"""
+        self._today()
+        return self._due_date_str
+    
+    def _generate_id(self, id_column):
+        """Generate unique ID"""
+        return self._generate_ids(id_column, 1)[0]
+    
+    def _generate_ids(self, id_column, count):
+        """Reserve a block of consecutive unique IDs"""
+        entry = self._table_meta(id_column)
+        first = entry['max_id'] + 1
+        entry['max_id'] += count
+        return range(first, first + count)
     
     def export_data_to_json(self):
         """Export all data to JSON for frontend use"""
         try:
             # Get all data
-            patients_df = self.get_all_patients()
-            appointments_df = self.get_all_appointments()
-            
-            # Read medical and billing files directly
-            medical_df = pd.read_csv(self.medical_file)
-            billing_df = pd.read_csv(self.billing_file)
-            
-            # Fill NaN values
-            patients_df = patients_df.fillna('')
-            appointments_df = appointments_df.fillna('')
-            medical_df = medical_df.fillna('')
-            billing_df = billing_df.fillna('')
-            
-            # Convert to dictionaries
-            data = {
-                'patients': patients_df.to_dict('records'),
-                'appointments': appointments_df.to_dict('records'),
-                'medical_records': medical_df.to_dict('records'),
-                'billing': billing_df.to_dict('records'),
-                'export_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
+            tables = (
+                ('patients', self._load(self.patients_file)),
+                ('appointments', self._load(self.appointments_file)),
+                ('medical_records', self._load(self.medical_file)),
+                ('billing', self._load(self.billing_file))
+            )
             
-            # Save to JSON
+            # Save to JSON one record at a time rather than building every
+            # table as a list of dicts first
             json_path = os.path.join(self.data_dir, 'hospital_data.json')
-            with open(json_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(json_path, 'wb') as f:
+                f.write(b'{')
+                for key, df in tables:
+                    columns = df.columns.tolist()
+                    f.write(f'"{key}": ['.encode())
+                    for i, values in enumerate(df.itertuples(index=False, name=None)):
+                        if i:
+                            f.write(b', ')
+                        f.write(_dump_record(dict(zip(columns, values))))
+                    f.write(b'], ')
+                export_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                f.write(f'"export_date": "{export_date}"}}'.encode())
             
             print(f"Data exported to {json_path}")
             return True
@@ -345,12 +644,13 @@ class HospitalDataManager:
     def get_system_stats(self):
         """Get basic system statistics"""
         try:
+            bills = self._table_meta('bill_id')
             stats = {
-                'total_patients': len(self.get_all_patients()),
-                'total_appointments': len(self.get_all_appointments()),
-                'total_medical_records': len(pd.read_csv(self.medical_file)),
-                'total_bills': len(self.get_all_bills()),
-                'total_revenue': float(self.get_all_bills()['amount'].sum()) if not self.get_all_bills().empty else 0,
+                'total_patients': self._table_meta('patient_id')['rows'],
+                'total_appointments': self._table_meta('appointment_id')['rows'],
+                'total_medical_records': self._table_meta('record_id')['rows'],
+                'total_bills': bills['rows'],
+                'total_revenue': bills['total_revenue'] if bills['rows'] else 0,
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             return stats
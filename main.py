@@ -2,16 +2,50 @@
 Hospital Management System - Main Application
 """
 import os
+import re
 import sys
 from datetime import datetime
 
-# Add current directory to path to import modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from data_manager import HospitalDataManager
-from analytics import HospitalAnalytics
-import pandas as pd
-import json
+
+# Numeric input, validated without raising and catching ValueError
+_INT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_RE = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+_NUMERIC_PATTERNS = {int: _INT_RE, float: _FLOAT_RE}
+
+# Display label and format of each system statistic
+_STAT_LABELS = {
+    'total_patients': 'Total Patients',
+    'total_appointments': 'Total Appointments',
+    'total_medical_records': 'Total Medical Records',
+    'total_bills': 'Total Bills',
+    'total_revenue': 'Total Revenue'
+}
+_STAT_FMT = {'total_revenue': '${:.2f}'.format}
+
+# Working directory, read once for building absolute paths in reports
+_CWD = os.getcwd()
+
+def _read_line(prompt):
+    """Prompt and read a line straight from a piped stdin"""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+# input() goes through the readline hook, which only helps at a terminal
+_read = input if sys.stdin is None or sys.stdin.isatty() else _read_line
+
+def _yesno(prompt):
+    """Ask a y/n question; any answer starting with y or Y counts as yes"""
+    ans = _read(prompt)
+    return bool(ans) and ans[0] in ('y', 'Y')
+
+def _abs(path):
+    """Absolute form of a path relative to the startup directory"""
+    return os.path.normpath(os.path.join(_CWD, path))
 
 def add_sample_data(dm):
     """Add sample data for demonstration"""
@@ -67,11 +101,7 @@ def add_sample_data(dm):
         }
     ]
     
-    patient_ids = []
-    for patient in sample_patients:
-        patient_id = dm.add_patient(**patient)
-        if patient_id:
-            patient_ids.append(patient_id)
+    patient_ids = dm.add_patients(sample_patients) or []
     
     print(f"Added {len(patient_ids)} sample patients")
     
@@ -112,8 +142,7 @@ def add_sample_data(dm):
             }
         ]
         
-        for appointment in sample_appointments:
-            dm.schedule_appointment(**appointment)
+        dm.schedule_appointments(sample_appointments)
         print("Added sample appointments")
     
     # Add sample medical records
@@ -148,8 +177,7 @@ def add_sample_data(dm):
             }
         ]
         
-        for record in sample_medical_records:
-            dm.add_medical_record(**record)
+        dm.add_medical_records(sample_medical_records)
         print("Added sample medical records")
     
     # Add sample bills
@@ -187,34 +215,62 @@ def add_sample_data(dm):
             }
         ]
         
-        for bill in sample_bills:
-            dm.generate_bill(**bill)
+        dm.generate_bills(sample_bills)
         print("Added sample bills")
     
     return patient_ids
 
 def get_user_input(prompt, input_type=str, default=None):
     """Helper function to get user input with validation"""
+    # Resolve the validation for this type once, not on every retry
+    pattern = _NUMERIC_PATTERNS.get(input_type)
+    error = f"Invalid input. Please enter a valid {input_type.__name__}."
+    
     while True:
-        try:
-            user_input = input(prompt).strip()
-            
-            if not user_input and default is not None:
-                return default
-            
-            if not user_input:
-                print("This field cannot be empty. Please enter a value.")
-                continue
-                
-            if input_type == int:
-                return int(user_input)
-            elif input_type == float:
-                return float(user_input)
-            else:
-                return user_input
-                
-        except ValueError:
-            print(f"Invalid input. Please enter a valid {input_type.__name__}.")
+        user_input = _read(prompt).strip()
+        
+        if not user_input and default is not None:
+            return default
+        
+        if not user_input:
+            print("This field cannot be empty. Please enter a value.")
+            continue
+        
+        if pattern is None:
+            return user_input
+        if pattern.fullmatch(user_input):
+            return input_type(user_input)
+        print(error)
+
+def _print_stats(stats, indent=''):
+    """Print system statistics with their display labels"""
+    for key, value in stats.items():
+        if key == 'timestamp':
+            continue
+        label = _STAT_LABELS.get(key) or key.replace('_', ' ').title()
+        print(f"{indent}{label}: {_STAT_FMT.get(key, str)(value)}")
+
+def _print_table(df, columns):
+    """Stream a tab-separated listing to stdout rather than building it as one string"""
+    sys.stdout.flush()
+    df[columns].to_csv(sys.stdout, sep='\t', index=False, lineterminator='\n')
+
+# Formatted patient listings for the patients frame they were built from.
+# The data manager returns the same frame until patients.csv changes
+_patients_tables = (None, {})
+
+def _patients_table(patients, columns, rows=None):
+    """Patients formatted with to_string, reformatted only when the table is re-read"""
+    global _patients_tables
+    if _patients_tables[0] is not patients:
+        _patients_tables = (patients, {})
+    
+    formatted = _patients_tables[1]
+    key = (tuple(columns), rows)
+    if key not in formatted:
+        shown = patients.head(rows) if rows is not None else patients
+        formatted[key] = shown[list(columns)].to_string(index=False)
+    return formatted[key]
 
 def add_patient_interactive(dm):
     """Allow user to add a new patient interactively"""
@@ -264,18 +320,18 @@ def schedule_appointment_interactive(dm):
     
     print("\nExisting Patients:")
     print("-" * 40)
-    for _, patient in patients.iterrows():
-        print(f"ID: {patient['patient_id']} | Name: {patient['name']} | Age: {patient['age']}")
+    for patient_id, name, age in patients[['patient_id', 'name', 'age']].itertuples(index=False, name=None):
+        print(f"ID: {patient_id} | Name: {name} | Age: {age}")
     
     patient_id = get_user_input("\nEnter Patient ID: ", int)
     
     # Check if patient exists
+    # get_patient_by_id reports an unknown ID itself
     patient = dm.get_patient_by_id(patient_id)
     if patient.empty:
-        print(f"Patient ID {patient_id} not found.")
         return None
     
-    print(f"\nScheduling appointment for: {patient.iloc[0]['name']}")
+    print(f"\nScheduling appointment for: {patient['name'].iloc[0]}")
     print("-" * 30)
     
     doctor_name = get_user_input("Doctor's Name: ")
@@ -314,18 +370,18 @@ def add_medical_record_interactive(dm):
     
     print("\nExisting Patients:")
     print("-" * 40)
-    for _, patient in patients.iterrows():
-        print(f"ID: {patient['patient_id']} | Name: {patient['name']}")
+    for patient_id, name in patients[['patient_id', 'name']].itertuples(index=False, name=None):
+        print(f"ID: {patient_id} | Name: {name}")
     
     patient_id = get_user_input("\nEnter Patient ID: ", int)
     
     # Check if patient exists
+    # get_patient_by_id reports an unknown ID itself
     patient = dm.get_patient_by_id(patient_id)
     if patient.empty:
-        print(f"Patient ID {patient_id} not found.")
         return None
     
-    print(f"\nAdding medical record for: {patient.iloc[0]['name']}")
+    print(f"\nAdding medical record for: {patient['name'].iloc[0]}")
     print("-" * 30)
     
     symptoms = get_user_input("Symptoms: ")
@@ -366,18 +422,18 @@ def generate_bill_interactive(dm):
     
     print("\nExisting Patients:")
     print("-" * 40)
-    for _, patient in patients.iterrows():
-        print(f"ID: {patient['patient_id']} | Name: {patient['name']}")
+    for patient_id, name in patients[['patient_id', 'name']].itertuples(index=False, name=None):
+        print(f"ID: {patient_id} | Name: {name}")
     
     patient_id = get_user_input("\nEnter Patient ID: ", int)
     
     # Check if patient exists
+    # get_patient_by_id reports an unknown ID itself
     patient = dm.get_patient_by_id(patient_id)
     if patient.empty:
-        print(f"Patient ID {patient_id} not found.")
         return None
     
-    print(f"\nGenerating bill for: {patient.iloc[0]['name']}")
+    print(f"\nGenerating bill for: {patient['name'].iloc[0]}")
     print("-" * 30)
     
     service_type = get_user_input("Service Type (e.g., Consultation, Tests, Surgery): ")
@@ -416,13 +472,86 @@ def search_patient_interactive(dm):
     print(f"\nFound {len(results)} patient(s):")
     print("-" * 50)
     
-    for _, patient in results.iterrows():
-        print(f"\nPatient ID: {patient['patient_id']}")
-        print(f"Name: {patient['name']}")
-        print(f"Age: {patient['age']} | Gender: {patient['gender']}")
-        print(f"Contact: {patient['contact']}")
-        print(f"Blood Group: {patient['blood_group']}")
-        print(f"Registered: {patient['registration_date']}")
+    display_cols = ['patient_id', 'name', 'age', 'gender', 'contact', 'blood_group', 'registration_date']
+    for patient_id, name, age, gender, contact, blood_group, registered in results[display_cols].itertuples(index=False, name=None):
+        print(f"\nPatient ID: {patient_id}")
+        print(f"Name: {name}")
+        print(f"Age: {age} | Gender: {gender}")
+        print(f"Contact: {contact}")
+        print(f"Blood Group: {blood_group}")
+        print(f"Registered: {registered}")
+
+def _view_patients(dm):
+    """Print every patient"""
+    patients = dm.get_all_patients()
+    if not patients.empty:
+        print("\nALL PATIENTS:")
+        print("-" * 60)
+        print(_patients_table(patients, ['patient_id', 'name', 'age', 'gender', 'contact']))
+    else:
+        print("No patients found.")
+
+def _view_appointments(dm):
+    """Print every appointment"""
+    appointments = dm.get_all_appointments()
+    if not appointments.empty:
+        print("\nALL APPOINTMENTS:")
+        print("-" * 70)
+        display_cols = ['appointment_id', 'patient_name', 'doctor_name', 
+                      'appointment_date', 'appointment_time', 'status']
+        _print_table(appointments, display_cols)
+    else:
+        print("No appointments found.")
+
+def _view_bills(dm):
+    """Print every bill and the total revenue"""
+    bills = dm.get_all_bills()
+    if not bills.empty:
+        print("\nALL BILLS:")
+        print("-" * 70)
+        display_cols = ['bill_id', 'patient_name', 'service_type', 
+                      'amount', 'status', 'due_date']
+        _print_table(bills, display_cols)
+        
+        # Show total
+        total = dm.get_total_revenue()
+        print(f"\nTotal Revenue: ${total:.2f}")
+    else:
+        print("No bills found.")
+
+def _view_medical_history(dm):
+    """Print the medical history of a patient chosen by ID"""
+    patient_id = get_user_input("Enter Patient ID to view medical history: ", int)
+    history = dm.get_patient_medical_history(patient_id)
+    
+    if not history.empty:
+        patient = dm.get_patient_by_id(patient_id)
+        patient_name = patient['name'].iloc[0] if not patient.empty else f"Patient {patient_id}"
+        
+        print(f"\nMEDICAL HISTORY FOR: {patient_name}")
+        print("=" * 60)
+        
+        display_cols = ['visit_date', 'symptoms', 'diagnosis', 'treatment', 'medication', 'tests', 'notes']
+        for visit_date, symptoms, diagnosis, treatment, medication, tests, notes in history[display_cols].itertuples(index=False, name=None):
+            print(f"\nVisit Date: {visit_date}")
+            print(f"Symptoms: {symptoms}")
+            print(f"Diagnosis: {diagnosis}")
+            print(f"Treatment: {treatment}")
+            print(f"Medication: {medication}")
+            print(f"Tests: {tests}")
+            if notes:
+                print(f"Notes: {notes}")
+            print("-" * 40)
+    else:
+        print(f"No medical records found for patient {patient_id}")
+
+# System data view choices (5 returns to the main menu)
+_VIEW_MENU = {
+    1: _view_patients,
+    2: _view_appointments,
+    3: _view_bills,
+    4: _view_medical_history
+}
 
 def view_system_data(dm):
     """View all system data"""
@@ -440,70 +569,52 @@ def view_system_data(dm):
         
         choice = get_user_input("\nEnter your choice (1-5): ", int)
         
-        if choice == 1:
-            patients = dm.get_all_patients()
-            if not patients.empty:
-                print("\nALL PATIENTS:")
-                print("-" * 60)
-                print(patients[['patient_id', 'name', 'age', 'gender', 'contact']].to_string(index=False))
-            else:
-                print("No patients found.")
-                
-        elif choice == 2:
-            appointments = dm.get_all_appointments()
-            if not appointments.empty:
-                print("\nALL APPOINTMENTS:")
-                print("-" * 70)
-                display_cols = ['appointment_id', 'patient_name', 'doctor_name', 
-                              'appointment_date', 'appointment_time', 'status']
-                print(appointments[display_cols].to_string(index=False))
-            else:
-                print("No appointments found.")
-                
-        elif choice == 3:
-            bills = dm.get_all_bills()
-            if not bills.empty:
-                print("\nALL BILLS:")
-                print("-" * 70)
-                display_cols = ['bill_id', 'patient_name', 'service_type', 
-                              'amount', 'status', 'due_date']
-                print(bills[display_cols].to_string(index=False))
-                
-                # Show total
-                total = bills['amount'].sum()
-                print(f"\nTotal Revenue: ${total:.2f}")
-            else:
-                print("No bills found.")
-                
-        elif choice == 4:
-            patient_id = get_user_input("Enter Patient ID to view medical history: ", int)
-            history = dm.get_patient_medical_history(patient_id)
-            
-            if not history.empty:
-                patient = dm.get_patient_by_id(patient_id)
-                patient_name = patient.iloc[0]['name'] if not patient.empty else f"Patient {patient_id}"
-                
-                print(f"\nMEDICAL HISTORY FOR: {patient_name}")
-                print("=" * 60)
-                
-                for _, record in history.iterrows():
-                    print(f"\nVisit Date: {record['visit_date']}")
-                    print(f"Symptoms: {record['symptoms']}")
-                    print(f"Diagnosis: {record['diagnosis']}")
-                    print(f"Treatment: {record['treatment']}")
-                    print(f"Medication: {record['medication']}")
-                    print(f"Tests: {record['tests']}")
-                    if record['notes']:
-                        print(f"Notes: {record['notes']}")
-                    print("-" * 40)
-            else:
-                print(f"No medical records found for patient {patient_id}")
-                
-        elif choice == 5:
+        if choice == 5:
             break
+        handler = _VIEW_MENU.get(choice)
+        if handler is not None:
+            handler(dm)
         else:
             print("Invalid choice. Please enter 1-5.")
 
+def _menu_analytics(dm):
+    """Generate analytics after confirmation"""
+    print("\n" + "="*50)
+    print("GENERATING ANALYTICS AND REPORTS")
+    print("="*50)
+    
+    if _yesno("Generate analytics? This will create HTML visualizations (y/n): "):
+        run_analytics(dm)
+    else:
+        print("Analytics generation skipped.")
+
+def _menu_stats(dm):
+    """Print system statistics"""
+    stats = dm.get_system_stats()
+    print("\nSYSTEM STATISTICS:")
+    print("-" * 30)
+    _print_stats(stats)
+
+def _menu_export(dm):
+    """Export all data to JSON"""
+    if dm.export_data_to_json():
+        print("Data exported to JSON successfully")
+    else:
+        print("Failed to export data")
+
+# Main menu choices (10 exits)
+_MENU = {
+    1: add_patient_interactive,
+    2: schedule_appointment_interactive,
+    3: add_medical_record_interactive,
+    4: generate_bill_interactive,
+    5: search_patient_interactive,
+    6: view_system_data,
+    7: _menu_analytics,
+    8: _menu_stats,
+    9: _menu_export
+}
+
 def interactive_main_menu(dm):
     """Interactive main menu for user operations"""
     while True:
@@ -525,65 +636,20 @@ def interactive_main_menu(dm):
         
         choice = get_user_input("\nEnter your choice (1-10): ", int)
         
-        if choice == 1:
-            add_patient_interactive(dm)
-            
-        elif choice == 2:
-            schedule_appointment_interactive(dm)
-            
-        elif choice == 3:
-            add_medical_record_interactive(dm)
-            
-        elif choice == 4:
-            generate_bill_interactive(dm)
-            
-        elif choice == 5:
-            search_patient_interactive(dm)
-            
-        elif choice == 6:
-            view_system_data(dm)
-            
-        elif choice == 7:
-            print("\n" + "="*50)
-            print("GENERATING ANALYTICS AND REPORTS")
-            print("="*50)
-            
-            analytics_response = input("Generate analytics? This will create HTML visualizations (y/n): ").strip().lower()
-            if analytics_response == 'y':
-                run_analytics(dm)
-            else:
-                print("Analytics generation skipped.")
-                
-        elif choice == 8:
-            stats = dm.get_system_stats()
-            print("\nSYSTEM STATISTICS:")
-            print("-" * 30)
-            for key, value in stats.items():
-                if key == 'total_revenue':
-                    print(f"{key.replace('_', ' ').title()}: ${value:.2f}")
-                elif key != 'timestamp':
-                    print(f"{key.replace('_', ' ').title()}: {value}")
-                    
-        elif choice == 9:
-            if dm.export_data_to_json():
-                print("Data exported to JSON successfully")
-            else:
-                print("Failed to export data")
-                
-        elif choice == 10:
+        if choice == 10:
             print("\nThank you for using Hospital Management System!")
             print("Exiting...")
             break
-            
+        handler = _MENU.get(choice)
+        if handler is not None:
+            handler(dm)
         else:
             print("Invalid choice. Please enter 1-10.")
         
         # Ask if user wants to continue
-        if choice != 10:
-            continue_response = input("\nReturn to main menu? (y/n): ").strip().lower()
-            if continue_response != 'y':
-                print("\nThank you for using Hospital Management System!")
-                break
+        if not _yesno("\nReturn to main menu? (y/n): "):
+            print("\nThank you for using Hospital Management System!")
+            break
 
 def display_system_status(dm):
     """Display system status and sample data"""
@@ -593,11 +659,7 @@ def display_system_status(dm):
     
     stats = dm.get_system_stats()
     print("\nSYSTEM STATISTICS:")
-    for key, value in stats.items():
-        if key == 'total_revenue':
-            print(f"   {key.replace('_', ' ').title()}: ${value:.2f}")
-        elif key != 'timestamp':
-            print(f"   {key.replace('_', ' ').title()}: {value}")
+    _print_stats(stats, indent='   ')
     
     # Display sample data
     print("\n" + "="*50)
@@ -609,8 +671,7 @@ def display_system_status(dm):
     if not patients.empty:
         print(f"\nPATIENTS ({len(patients)} total):")
         print("-" * 40)
-        display_df = patients[['patient_id', 'name', 'age', 'gender']].head()
-        print(display_df.to_string(index=False))
+        print(_patients_table(patients, ['patient_id', 'name', 'age', 'gender'], rows=5))
     
     # Appointments
     appointments = dm.get_all_appointments()
@@ -638,15 +699,22 @@ def display_system_status(dm):
     
     return stats
 
+# Analytics for the current data manager, kept so its caches carry over between runs
+_analytics = None
+
 def run_analytics(dm):
     """Run analytics and generate visualizations"""
+    global _analytics
     print("\n" + "="*50)
     print("STARTING ANALYTICS GENERATION")
     print("="*50)
     
     try:
-        analytics = HospitalAnalytics(dm)
-        dashboard_data = analytics.generate_all_reports()
+        if _analytics is None or _analytics.dm is not dm:
+            # Imported here so sessions that never generate reports skip loading plotly
+            from analytics import HospitalAnalytics
+            _analytics = HospitalAnalytics(dm)
+        dashboard_data = _analytics.generate_all_reports()
         
         # Display analytics summary
         if dashboard_data and 'error' not in dashboard_data:
@@ -691,26 +759,24 @@ def main():
         dm = HospitalDataManager()
         
         # Check if we have existing data
-        existing_patients = dm.get_all_patients()
+        patient_count = dm.patient_count
         
         print("\nSYSTEM INITIALIZATION")
         print("-" * 30)
         
-        if len(existing_patients) == 0:
+        if patient_count == 0:
             print("No existing data found.")
-            response = input("Would you like to add sample data? (y/n): ").strip().lower()
-            if response == 'y':
+            if _yesno("Would you like to add sample data? (y/n): "):
                 print("\nAdding sample data...")
                 patient_ids = add_sample_data(dm)
             else:
                 print("Starting with empty database.")
         else:
-            print(f"Found existing data with {len(existing_patients)} patients.")
+            print(f"Found existing data with {patient_count} patients.")
         
         # Display system status
         print("\n" + "="*50)
-        display_response = input("Display system status? (y/n): ").strip().lower()
-        if display_response == 'y':
+        if _yesno("Display system status? (y/n): "):
             stats = display_system_status(dm)
         
         # Ask about mode selection
@@ -742,16 +808,15 @@ def main():
             print("QUICK MODE - GENERATING ANALYTICS")
             print("="*50)
             
-            analytics_response = input("Generate analytics and visualizations? (y/n): ").strip().lower()
-            if analytics_response == 'y':
+            if _yesno("Generate analytics and visualizations? (y/n): "):
                 run_analytics(dm)
                 
                 print("\n" + "="*60)
                 print("ANALYTICS GENERATION COMPLETE!")
                 print("="*60)
                 print("\nFiles created:")
-                print(f"   Data files: {os.path.abspath(dm.data_dir)}/")
-                print(f"   Visualizations: {os.path.abspath('visualizations/')}/")
+                print(f"   Data files: {_abs(dm.data_dir)}/")
+                print(f"   Visualizations: {_abs('visualizations')}/")
                 print("\nNext steps:")
                 print("   1. Open HTML files in the 'visualizations/' folder")
                 print("   2. Check 'data/hospital_data.json' for complete dataset")